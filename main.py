@@ -4,11 +4,22 @@ from mitreattack.stix20 import MitreAttackData
 from fastapi import HTTPException
 import uvicorn
 import json
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from operator import itemgetter
 from typing import Optional
 import asyncio
 import logging
-import threading
 import os
+import mmap
+import stix2
+from array import array
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时回退到标准库 json
+    orjson = None
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
@@ -23,89 +34,298 @@ mcp = FastMCP(
 )
 
 attack_data = None
+# 技术ID -> 下标，下标对应以下各并行列表中的位置
 TECH_CACHE = None
-attack_data_lock = threading.Lock()
-
-def ensure_attack_data_loaded():
-    global attack_data, TECH_CACHE
-    if attack_data is None or TECH_CACHE is None:
-        with attack_data_lock:
-            if attack_data is None or TECH_CACHE is None:
-                from mitreattack.stix20 import MitreAttackData
-                logger.info("首次加载ATT&CK数据集，可能需要几秒...")
-                attack_data = MitreAttackData("enterprise-attack.json")
-                TECH_CACHE = {t.external_references[0].external_id: t for t in attack_data.get_techniques()}
-                logger.info(f"成功加载 {len(TECH_CACHE)} 个技术条目")
+# 技术数据按列存储（SoA），加载时一次性计算，查询热路径不再访问 STIX 对象属性
+TECH_IDS: list[str] = []
+TECH_NAMES: list[str] = []
+TECH_SUMMARIES: list[str] = []
+TECH_OBJS: list = []
+# 名称搜索的前缀结果缓存：搜索词 -> 匹配的技术下标列表
+PREFIX_CACHE: dict[str, list[int]] = {}
+PREFIX_CACHE_MAX = 256
+# 所有小写名称以 \0 分隔拼接的连续字节串，名称搜索只扫描这块内存，不再保留逐个的小写 str 对象
+CORPUS = b""
+# 每个名称在 CORPUS 中的起始偏移，末尾追加一个哨兵 (len(CORPUS) + 1)，第 i 个名称位于 [OFFSETS[i], OFFSETS[i + 1] - 1)
+OFFSETS = array("I")
+# 名称二元组倒排索引：两字符片段 -> 包含该片段的技术下标集合
+BIGRAM_INDEX: dict[str, set[int]] = {}
+# 按小写名称字节序排列的技术下标，前缀搜索在其上二分定位区间，相当于扁平数组形式的字典树
+NAME_PREFIX_ORDER = array("I")
+# 技术 STIX ID -> 已格式化的子技术/缓解措施/检测方法，加载时一次性遍历关系图生成
+SUBTECH_MAP: dict[str, list[dict]] = {}
+# 缓解措施与检测方法逐条预序列化为JSON文本并存为不可变元组，每次请求直接返回同一对象，不再分配新的列表和字典
+MITIGATION_MAP: dict[str, tuple[str, ...]] = {}
+DETECTION_MAP: dict[str, tuple[str, ...]] = {}
+# 技术ID -> format_technique_data 结果预序列化的JSON文本；FastMCP 对 str 返回值直接作为文本内容发送，省去每次请求的序列化
+FORMATTED_TECH_JSON: dict[str, str] = {}
+# 所有战术逐条预序列化的JSON文本（FastMCP 将元组中每个元素作为一条文本内容发送）
+TACTICS_JSON: tuple[str, ...] = ()
+# 首次请求时加载数据集的共享任务，仅在启动时未完成加载的情况下使用
+_lazy_load_task = None
+
+# 从 get_all_* 关系查询结果条目中取出 STIX 对象
+_get_object = itemgetter("object")
+
+def _external_id(obj) -> str:
+    """取 STIX 对象的 ATT&CK 外部ID (如 "T1059.001"、"M1047"、"TA0006")"""
+    return obj.external_references[0].external_id
+
+def _dumps(obj) -> str:
+    """将每次请求动态生成的结果序列化为JSON文本，优先使用 orjson"""
+    if orjson is None:
+        return json.dumps(obj)
+    return orjson.dumps(obj).decode()
+
+def _read_stix_bundle(path: str) -> dict:
+    """读取STIX数据文件；优先通过 mmap + orjson 解析，省去标准库 json 的分词开销"""
+    if orjson is None:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return orjson.loads(memoryview(m))
+
+def _load_attack_data():
+    """加载ATT&CK数据集并构建全部查询索引
+
+    所有数据先在局部变量中构建，全部成功后再一次性替换模块级变量，TECH_CACHE 最后设置；
+    中途失败不会留下半成品，可安全重试。发布后各数据只读。
+    """
+    global attack_data, TECH_CACHE, TECH_IDS, TECH_NAMES, TECH_SUMMARIES, TECH_OBJS
+    global CORPUS, OFFSETS, BIGRAM_INDEX, NAME_PREFIX_ORDER
+    global SUBTECH_MAP, MITIGATION_MAP, DETECTION_MAP, FORMATTED_TECH_JSON, TACTICS_JSON
+    from mitreattack.stix20 import MitreAttackData
+    logger.info("正在加载ATT&CK数据集，可能需要几秒...")
+    bundle = _read_stix_bundle("enterprise-attack.json")
+    data = MitreAttackData(src=stix2.MemoryStore(stix_data=bundle))
+    techs = {_external_id(t): t for t in data.get_techniques()}
+    tech_ids = list(techs)
+    tech_objs = list(techs.values())
+    tech_names = [t.name for t in tech_objs]
+    tech_summaries = [t.description[:150] + "..." for t in tech_objs]
+    names_lower = [n.lower() for n in tech_names]
+
+    encoded = [n.encode() for n in names_lower]
+    offsets = array("I")
+    offset = 0
+    for name_bytes in encoded:
+        offsets.append(offset)
+        offset += len(name_bytes) + 1
+    offsets.append(offset)
+    corpus = b"\x00".join(encoded)
+    prefix_order = array("I", sorted(range(len(encoded)), key=encoded.__getitem__))
+    bigram_index = {}
+    for pos, lname in enumerate(names_lower):
+        for i in range(len(lname) - 1):
+            bigram_index.setdefault(lname[i:i + 2], set()).add(pos)
+
+    subtech_map = {
+        stix_id: [{
+            "id": _external_id(st),
+            "name": st.name
+        } for st in map(_get_object, subtechniques)]
+        for stix_id, subtechniques in data.get_all_subtechniques_of_all_techniques().items()
+    }
+    mitigation_map = {
+        stix_id: tuple(json.dumps({
+            "id": _external_id(m),
+            "name": m.name,
+            "description": m.description
+        }) for m in map(_get_object, mitigations))
+        for stix_id, mitigations in data.get_all_mitigations_mitigating_all_techniques().items()
+    }
+    detection_map = {
+        stix_id: tuple(json.dumps({
+            "source": d.name,
+            "description": d.description
+        }) for d in map(_get_object, detections))
+        for stix_id, detections in data.get_all_datacomponents_detecting_all_techniques().items()
+    }
+    formatted_json = {
+        tech_id: json.dumps(format_technique_data(t, subtech_map))
+        for tech_id, t in zip(tech_ids, tech_objs)
+    }
+    tactics_json = tuple(json.dumps({
+        "id": _external_id(t),
+        "name": t.name,
+        "description": t.description
+    }) for t in data.get_tactics())
+
+    attack_data = data
+    TECH_IDS, TECH_NAMES, TECH_SUMMARIES, TECH_OBJS = tech_ids, tech_names, tech_summaries, tech_objs
+    CORPUS, OFFSETS, BIGRAM_INDEX, NAME_PREFIX_ORDER = corpus, offsets, bigram_index, prefix_order
+    SUBTECH_MAP, MITIGATION_MAP, DETECTION_MAP = subtech_map, mitigation_map, detection_map
+    FORMATTED_TECH_JSON, TACTICS_JSON = formatted_json, tactics_json
+    TECH_CACHE = {tech_id: pos for pos, tech_id in enumerate(tech_ids)}
+    logger.info("成功加载 %d 个技术条目", len(TECH_CACHE))
+
+def _clear_failed_lazy_load(task):
+    """加载任务被取消或失败时清除该任务，使下一次请求重新尝试加载"""
+    global _lazy_load_task
+    if _lazy_load_task is task and (task.cancelled() or task.exception() is not None):
+        _lazy_load_task = None
+
+async def _load_attack_data_lazily():
+    """在线程池中加载数据集，避免阻塞事件循环；同一事件循环内的并发请求共享同一个加载任务
+
+    各请求通过 asyncio.shield 等待共享任务，单个请求被取消（如客户端断开）不会取消其他请求的加载；
+    加载被取消或失败时清除该任务，下一次请求会重新尝试加载（例如数据文件稍后才就位）。
+    """
+    global _lazy_load_task
+    if _lazy_load_task is None:
+        _lazy_load_task = asyncio.get_running_loop().run_in_executor(None, _load_attack_data)
+        _lazy_load_task.add_done_callback(_clear_failed_lazy_load)
+    await asyncio.shield(_lazy_load_task)
+
+def _normalize_technique_id(technique_id: str) -> str:
+    """规范化技术ID，已是大写的ID (如 "T1059.001") 直接返回，跳过 upper()"""
+    return technique_id if technique_id.isupper() else technique_id.upper()
+
+def _technique_not_found(technique_id: str) -> dict:
+    """技术ID不存在时的统一错误响应"""
+    return {"error": f"未找到技术ID {technique_id}"}
+
+@lru_cache(maxsize=256)
+def _search_names(term: str) -> tuple:
+    """按小写搜索词过滤技术名称，返回匹配的技术下标，复用已缓存的最长前缀结果缩小扫描范围
+
+    调用方保证搜索词至少 MIN_SEARCH_TERM_LEN 个字符，因此总能使用二元组索引。
+    """
+    # 名称中不含 \0，分隔符保证匹配不会跨越两个名称
+    if "\x00" in term:
+        return ()
+    needle = term.encode()
+
+    # 包含 "phish" 的名称必然包含 "phis"，因此只需过滤前缀的结果
+    candidates = None
+    for i in range(len(term) - 1, 0, -1):
+        cached = PREFIX_CACHE.get(term[:i])
+        if cached is not None:
+            candidates = cached
+            break
+
+    if candidates is None:
+        # 取搜索词所有二元组倒排表的交集作为候选，再做子串校验
+        postings = sorted(
+            (BIGRAM_INDEX.get(term[i:i + 2], set()) for i in range(len(term) - 1)),
+            key=len
+        )
+        candidates = sorted(set.intersection(*postings))
+    corpus, offsets = CORPUS, OFFSETS
+    matched = [pos for pos in candidates if corpus.find(needle, offsets[pos], offsets[pos + 1] - 1) != -1]
+    if len(PREFIX_CACHE) >= PREFIX_CACHE_MAX:
+        PREFIX_CACHE.clear()
+    PREFIX_CACHE[term] = matched
+    return tuple(matched)
+
+# 名称搜索关键词的最小长度，过短的关键词几乎匹配全表
+MIN_SEARCH_TERM_LEN = 3
+# 批量名称搜索单次请求的关键词数量上限
+MAX_BATCH_TERMS = 32
+# 技术ID格式，如 T1059 或 T1059.001
+TECH_ID_PATTERN = re.compile(r"T\d{4}(\.\d{3})?")
+
+def _name_bytes(pos: int) -> bytes:
+    """第 pos 个技术的小写名称在 CORPUS 中的字节"""
+    return CORPUS[OFFSETS[pos]:OFFSETS[pos + 1] - 1]
+
+@lru_cache(maxsize=256)
+def _search_name_prefix(term: str) -> tuple:
+    """返回小写名称以搜索词开头的技术下标，耗时 O(log N + 结果数)，无需整表扫描"""
+    needle = term.encode()
+    lo = bisect_left(NAME_PREFIX_ORDER, needle, key=_name_bytes)
+    # UTF-8 中不会出现 0xff 字节，needle + b"\xff" 大于所有以 needle 开头的名称
+    hi = bisect_left(NAME_PREFIX_ORDER, needle + b"\xff", lo, key=_name_bytes)
+    return tuple(sorted(NAME_PREFIX_ORDER[lo:hi]))
+
+def _technique_summary(pos: int) -> dict:
+    """名称搜索结果中单个技术的摘要"""
+    return {
+        "id": TECH_IDS[pos],
+        "name": TECH_NAMES[pos],
+        "description": TECH_SUMMARIES[pos]  # 摘要显示
+    }
 
 # 核心查询工具
 @mcp.tool(
     name="query_technique",
-    description="通过技术ID精确查询或技术名称模糊搜索ATT&CK攻击技术的详细信息。ID查询返回单个技术的完整数据，名称搜索返回匹配技术列表的摘要。"
+    description="通过技术ID精确查询或技术名称模糊搜索ATT&CK攻击技术的详细信息。ID查询返回单个技术的完整数据，名称搜索返回匹配技术列表的摘要，可选按名称前缀匹配。"
 )
 async def query_attack_technique(
     technique_id: Optional[str] = None, 
-    tech_name: Optional[str] = None
+    tech_name: Optional[str] = None,
+    prefix: bool = False
 ):
     """
     根据提供的技术ID或技术名称查询ATT&CK攻击技术。
 
     当提供 `technique_id` 时 (例如 "T1059.001")，执行精确匹配查询。
-    成功时返回该技术的详细信息，包括：ID, 名称, 描述, 适用平台, Kill Chain阶段, 相关参考资料, 以及子技术列表 (如果存在)。
+    成功时返回该技术详细信息的JSON文本，包括：ID, 名称, 描述, 适用平台, Kill Chain阶段, 相关参考资料, 以及子技术列表 (如果存在)。
     如果ID无效或未找到，将返回一个包含错误信息的字典。
 
-    当提供 `tech_name` 时 (例如 "phishing")，执行模糊匹配搜索。
-    返回一个包含技术列表摘要的字典，其中每个条目包含技术的ID、名称和简短描述。
+    当提供 `tech_name` 时 (例如 "phishing")，执行模糊匹配搜索，关键词至少3个字符。
+    如果 `tech_name` 本身是技术ID格式 (例如 "T1566")，则按ID精确查询处理。
+    当 `prefix` 为 True 时，只匹配名称以关键词开头的技术。
+    返回一个包含技术列表摘要的JSON文本，其中每个条目包含技术的ID、名称和简短描述。
     同时返回匹配结果的数量。
 
     参数:
         technique_id (Optional[str]): 要查询的ATT&CK技术ID。如果提供此参数，则优先使用ID进行精确查询。
         tech_name (Optional[str]): 用于模糊搜索的ATT&CK技术名称中的关键词。如果未提供 `technique_id`，则使用此参数进行搜索。
+        prefix (bool): 为 True 时按名称前缀匹配 `tech_name`，默认 False 按名称中任意位置匹配。
 
     返回:
-        dict: 
-            - 如果是ID查询且成功，返回包含技术完整详情的字典。
-            - 如果是名称搜索，返回一个格式为 {"results": [...], "count": N} 的字典，其中 "results" 是技术摘要列表，"count" 是结果数量。
-            - 如果参数无效 (例如两者都未提供) 或查询过程中发生内部错误，可能返回包含 "error" 键的字典或引发HTTPException。
+        dict | str: 
+            - 如果是ID查询且成功，返回技术完整详情字典预先序列化后的JSON字符串。
+            - 如果是名称搜索，返回一个格式为 {"results": [...], "count": N} 的JSON字符串，其中 "results" 是技术摘要列表，"count" 是结果数量。
+            - 如果参数无效 (例如两者都未提供或搜索关键词过短) 或查询过程中发生内部错误，可能返回包含 "error" 键的字典或引发HTTPException。
     """
-    ensure_attack_data_loaded()
-    logger.info(f"收到查询请求 - ID: {technique_id}, 名称: {tech_name}")
+    if TECH_CACHE is None:
+        await _load_attack_data_lazily()
+    logger.info("收到查询请求 - ID: %s, 名称: %s", technique_id, tech_name)
     try:
+        if not technique_id and tech_name and TECH_ID_PATTERN.fullmatch(tech_name.upper()):
+            # 名称参数中传入的是技术ID，直接走ID查询，避免整表扫描
+            technique_id = tech_name
+
         if technique_id:
             # ID精确查询逻辑
-            if technique_id.upper() not in TECH_CACHE:
-                logger.warning(f"未找到技术ID: {technique_id}")
-                return {"error": f"未找到技术ID {technique_id}"}
+            tid = _normalize_technique_id(technique_id)
+            data = FORMATTED_TECH_JSON.get(tid)
+            if data is None:
+                logger.warning("未找到技术ID: %s", technique_id)
+                return _technique_not_found(technique_id)
             
-            tech = TECH_CACHE[technique_id.upper()]
-            logger.info(f"成功查询到技术: {tech.name}")
-            return format_technique_data(tech)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("成功查询到技术: %s", TECH_NAMES[TECH_CACHE[tid]])
+            return data
             
         elif tech_name:
             # 名称模糊搜索逻辑
-            results = []
+            if len(tech_name) < MIN_SEARCH_TERM_LEN:
+                logger.warning("搜索关键词过短: '%s'", tech_name)
+                raise HTTPException(status_code=400, detail=f"搜索关键词至少{MIN_SEARCH_TERM_LEN}个字符")
             search_term = tech_name.lower()
-            for tech in TECH_CACHE.values():
-                if search_term in tech.name.lower():
-                    results.append({
-                        "id": tech.external_references[0].external_id,
-                        "name": tech.name,
-                        "description": tech.description[:150] + "..."  # 摘要显示
-                    })
-            logger.info(f"名称搜索 '{tech_name}' 找到 {len(results)} 个结果")
-            return {"results": results, "count": len(results)}
+            positions = _search_name_prefix(search_term) if prefix else _search_names(search_term)
+            results = [_technique_summary(pos) for pos in positions]
+            logger.debug("名称搜索 '%s' 找到 %d 个结果", tech_name, len(results))
+            return _dumps({"results": results, "count": len(results)})
             
         else:
             logger.error("请求缺少必要参数")
             raise HTTPException(status_code=400, detail="必须提供ID或名称参数")
             
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"查询过程中发生错误: {str(e)}")
+        logger.error("查询过程中发生错误: %s", e)
         raise HTTPException(status_code=500, detail=f"查询失败: {str(e)}")
 
-def format_technique_data(tech):
-    """标准化技术数据格式"""
+def format_technique_data(tech, subtech_map: dict[str, list[dict]]):
+    """标准化技术数据格式，subtech_map 为 技术 STIX ID -> 子技术列表"""
     data = {
-        "id": tech.external_references[0].external_id,
+        "id": _external_id(tech),
         "name": tech.name,
         "description": tech.description,
         "platforms": tech.x_mitre_platforms,
@@ -113,22 +333,54 @@ def format_technique_data(tech):
         "references": [
             {
                 "source": ref.source_name,
-                "url": ref.url
+                "url": ref.get("url")
             } for ref in tech.external_references
         ]
     }
     
     # 添加子技术信息
     # Use the technique's STIX ID to get subtechniques
-    subtechniques = attack_data.get_subtechniques_of_technique(tech.id)
+    subtechniques = subtech_map.get(tech.id)
     if subtechniques:
-        data["subtechniques"] = [{
-            "id": st["object"].external_references[0].external_id,
-            "name": st["object"].name
-        } for st in subtechniques]
+        data["subtechniques"] = subtechniques
     
     return data
 
+@mcp.tool(
+    name="batch_query_techniques",
+    description="使用多个技术名称关键词批量模糊搜索ATT&CK攻击技术，返回每个关键词匹配技术列表的摘要。"
+)
+async def batch_query_techniques(tech_names: list[str]):
+    """
+    根据一组技术名称关键词批量模糊搜索ATT&CK攻击技术。
+
+    适用于预先确定查询集合的批量客户端。每个关键词执行与 query_technique 相同的名称搜索，
+    搜索结果按关键词缓存，重复的批量查询直接命中缓存。
+
+    参数:
+        tech_names (list[str]): 技术名称关键词列表 (例如 ["phishing", "powershell"])，最多32个，每个关键词至少3个字符。
+
+    返回:
+        str: JSON文本，格式为 {关键词: {"results": [...], "count": N}, ...}，结果条目与 query_technique 的名称搜索一致。
+             如果关键词过多或存在过短的关键词，引发HTTPException。
+    """
+    if TECH_CACHE is None:
+        await _load_attack_data_lazily()
+    logger.info("收到批量查询请求 - 名称: %s", tech_names)
+    if len(tech_names) > MAX_BATCH_TERMS:
+        logger.warning("批量查询关键词过多: %d", len(tech_names))
+        raise HTTPException(status_code=400, detail=f"一次最多查询{MAX_BATCH_TERMS}个关键词")
+    short_terms = [name for name in tech_names if len(name) < MIN_SEARCH_TERM_LEN]
+    if short_terms:
+        logger.warning("搜索关键词过短: %s", short_terms)
+        raise HTTPException(status_code=400, detail=f"搜索关键词至少{MIN_SEARCH_TERM_LEN}个字符")
+
+    response = {}
+    for name in tech_names:
+        results = [_technique_summary(pos) for pos in _search_names(name.lower())]
+        response[name] = {"results": results, "count": len(results)}
+    return _dumps(response)
+
 @mcp.tool(
     name="query_mitigations",
     description="根据ATT&CK技术ID查询相关的缓解措施列表。为每个缓解措施提供ID、名称和描述。"
@@ -141,20 +393,16 @@ async def query_mitigations(technique_id: str):
         technique_id (str): 要查询缓解措施的ATT&CK技术ID (例如 "T1059.001")。ID必须精确匹配。
 
     返回:
-        list: 一个包含缓解措施对象的列表。每个对象包含 "id", "name", 和 "description"。
+        tuple: 一个包含缓解措施对象JSON文本的元组。每个对象包含 "id", "name", 和 "description"。
               如果技术ID无效或未找到，返回一个包含 "error" 键的字典，例如: {"error": "未找到技术ID TXXXX"}。
     """
-    ensure_attack_data_loaded()
-    if technique_id.upper() not in TECH_CACHE:
-        return {"error": f"未找到技术ID {technique_id}"}
+    if TECH_CACHE is None:
+        await _load_attack_data_lazily()
+    pos = TECH_CACHE.get(_normalize_technique_id(technique_id))
+    if pos is None:
+        return _technique_not_found(technique_id)
     
-    tech = TECH_CACHE[technique_id.upper()]
-    mitigations = attack_data.get_mitigations_mitigating_technique(tech.id)
-    return [{
-        "id": m["object"].external_references[0].external_id,
-        "name": m["object"].name,
-        "description": m["object"].description
-    } for m in mitigations]
+    return MITIGATION_MAP.get(TECH_OBJS[pos].id, ())
 
 @mcp.tool(
     name="query_detections",
@@ -168,19 +416,16 @@ async def query_detections(technique_id: str):
         technique_id (str): 要查询检测方法的ATT&CK技术ID (例如 "T1059.001")。ID必须精确匹配。
 
     返回:
-        list: 一个包含检测数据组件对象的列表。每个对象包含 "source" (数据组件名称) 和 "description"。
+        tuple: 一个包含检测数据组件对象JSON文本的元组。每个对象包含 "source" (数据组件名称) 和 "description"。
               如果技术ID无效或未找到，返回一个包含 "error" 键的字典，例如: {"error": "未找到技术ID TXXXX"}。
     """
-    ensure_attack_data_loaded()
-    if technique_id.upper() not in TECH_CACHE:
-        return {"error": f"未找到技术ID {technique_id}"}
+    if TECH_CACHE is None:
+        await _load_attack_data_lazily()
+    pos = TECH_CACHE.get(_normalize_technique_id(technique_id))
+    if pos is None:
+        return _technique_not_found(technique_id)
     
-    tech = TECH_CACHE[technique_id.upper()]
-    detections = attack_data.get_datacomponents_detecting_technique(tech.id)
-    return [{
-        "source": d["object"].name,
-        "description": d["object"].description
-    } for d in detections]
+    return DETECTION_MAP.get(TECH_OBJS[pos].id, ())
 
 # 附加功能：战术列表查询
 @mcp.tool(
@@ -195,17 +440,22 @@ async def get_all_tactics():
         无
 
     返回:
-        list: 一个包含战术对象的列表。每个对象包含 "id", "name", 和 "description"。
+        tuple: 一个包含战术对象JSON文本的元组。每个对象包含 "id", "name", 和 "description"。
     """
-    ensure_attack_data_loaded()
-    logger.info("正在获取所有战术列表")
-    tactics = [{
-        "id": t.external_references[0].external_id,
-        "name": t.name,
-        "description": t.description
-    } for t in attack_data.get_tactics()]
-    logger.info(f"返回 {len(tactics)} 个战术")
-    return tactics
+    if TECH_CACHE is None:
+        await _load_attack_data_lazily()
+    logger.debug("返回 %d 个战术", len(TACTICS_JSON))
+    return TACTICS_JSON
+
+# 默认在导入时一次性加载数据集，之后各工具直接读取只读的索引；
+# 设置 LAZY_LOAD 环境变量或数据文件缺失时，改为首次请求时加载
+if os.environ.get("LAZY_LOAD"):
+    logger.info("已设置 LAZY_LOAD，ATT&CK数据集将在首次请求时加载")
+else:
+    try:
+        _load_attack_data()
+    except FileNotFoundError as e:
+        logger.warning("未找到ATT&CK数据文件，将在后续请求时重试加载: %s", e)
 
 app = mcp.sse_app()
 